@@ -21,6 +21,8 @@ setup(
     extras_require={
         "dev": [
             "pytest>=7.0.0",
+            "pytest-xdist>=3.0.0",
+            "mongomock>=4.1.0",
             "black>=22.0.0",
             "isort>=5.10.1",
             "pylint>=2.12.0",
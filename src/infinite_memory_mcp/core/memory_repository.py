@@ -7,6 +7,7 @@ providing CRUD operations for various memory types.
 
 import uuid
 import threading
+from collections import defaultdict
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
@@ -954,6 +955,36 @@ class MemoryRepository:
         
         return summaries
     
+    def get_summaries_for_conversations(
+        self,
+        conversation_ids: List[str]
+    ) -> Dict[str, List[SummaryMemory]]:
+        """
+        Get summaries for several conversations in a single query.
+        
+        Args:
+            conversation_ids: The IDs of the conversations
+            
+        Returns:
+            Dictionary mapping conversation ID to its summaries, newest first.
+            Conversations without summaries are omitted.
+        """
+        collection = mongo_manager.get_collection("summaries")
+        
+        # Build the query
+        query = {"conversation_id": {"$in": list(conversation_ids)}}
+        
+        # Execute the query
+        cursor = collection.find(query).sort("timestamp", -1)
+        
+        # Group SummaryMemory objects by conversation
+        summaries = defaultdict(list)
+        for doc in cursor:
+            summary = dict_to_dataclass(doc, SummaryMemory)
+            summaries[summary.conversation_id].append(summary)
+        
+        return dict(summaries)
+    
     def get_latest_conversation_summaries(
         self,
         limit: int = 10,
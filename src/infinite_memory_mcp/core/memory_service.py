@@ -503,7 +503,8 @@ class MemoryService:
         self,
         limit: int = 10,
         scope: Optional[str] = None,
-        include_messages: bool = False
+        include_messages: bool = False,
+        include_summaries: bool = False
     ) -> Dict[str, Any]:
         """
         Get a list of recent conversations.
@@ -512,6 +513,7 @@ class MemoryService:
             limit: Maximum number of conversations to return
             scope: Optional scope to filter by
             include_messages: Whether to include the first few messages
+            include_summaries: Whether to include each conversation's summaries
             
         Returns:
             Dictionary with status and conversations list
@@ -534,6 +536,17 @@ class MemoryService:
                 for msg in conv["preview_messages"]:
                     msg["timestamp"] = msg["timestamp"].isoformat()
         
+        # Fetch summaries for all listed conversations in one query
+        if include_summaries and conversations:
+            summaries = memory_repository.get_summaries_for_conversations(
+                [conv["conversation_id"] for conv in conversations]
+            )
+            for conv in conversations:
+                conv["summaries"] = [
+                    self._format_summary(summary)
+                    for summary in summaries.get(conv["conversation_id"], [])
+                ]
+        
         return {
             "status": "OK",
             "conversations": conversations,
@@ -637,25 +650,7 @@ class MemoryService:
                 scope=scope
             )
         
-        results = []
-        for summary in summaries:
-            time_range = None
-            if summary.time_range:
-                time_range = {
-                    "from": summary.time_range.get("from", "").isoformat() if isinstance(summary.time_range.get("from"), datetime) else summary.time_range.get("from"),
-                    "to": summary.time_range.get("to", "").isoformat() if isinstance(summary.time_range.get("to"), datetime) else summary.time_range.get("to")
-                }
-                
-            results.append({
-                "summary_id": summary.id,
-                "conversation_id": summary.conversation_id,
-                "summary_text": summary.summary_text,
-                "timestamp": summary.timestamp.isoformat(),
-                "scope": summary.scope,
-                "tags": summary.tags,
-                "time_range": time_range,
-                "message_count": len(summary.message_refs) if summary.message_refs else 0
-            })
+        results = [self._format_summary(summary) for summary in summaries]
         
         return {
             "status": "OK",
@@ -663,6 +658,34 @@ class MemoryService:
             "count": len(results)
         }
     
+    def _format_summary(self, summary: SummaryMemory) -> Dict[str, Any]:
+        """
+        Format a summary for a JSON response.
+        
+        Args:
+            summary: The summary to format
+            
+        Returns:
+            Dictionary with the summary fields
+        """
+        time_range = None
+        if summary.time_range:
+            time_range = {
+                "from": summary.time_range.get("from", "").isoformat() if isinstance(summary.time_range.get("from"), datetime) else summary.time_range.get("from"),
+                "to": summary.time_range.get("to", "").isoformat() if isinstance(summary.time_range.get("to"), datetime) else summary.time_range.get("to")
+            }
+        
+        return {
+            "summary_id": summary.id,
+            "conversation_id": summary.conversation_id,
+            "summary_text": summary.summary_text,
+            "timestamp": summary.timestamp.isoformat(),
+            "scope": summary.scope,
+            "tags": summary.tags,
+            "time_range": time_range,
+            "message_count": len(summary.message_refs) if summary.message_refs else 0
+        }
+    
     def _generate_conversation_summary(self, memories: List[ConversationMemory]) -> str:
         """
         Generate a summary for a conversation.
@@ -205,6 +205,25 @@ class MongoManager:
                 self.client = None
             return False
     
+    def attach_client(self, client: MongoClient, db_name: Optional[str] = None) -> None:
+        """
+        Use an existing MongoDB client instead of starting a connection.
+        
+        This allows an in-process client such as mongomock to be injected,
+        e.g. in tests.
+        
+        Args:
+            client: The MongoDB client to use
+            db_name: The database to use (defaults to the configured one)
+        """
+        if db_name is not None:
+            self.db_name = db_name
+        
+        self.client = client
+        self.db = client[self.db_name]
+        self.indexes_created = False
+        self._ensure_indexes()
+    
     def stop(self) -> None:
         """Stop the MongoDB connection."""
         if self.use_embedded:
@@ -6,6 +6,7 @@ It encapsulates the embedding model and provides methods for generating
 and working with embeddings.
 """
 
+import importlib.util
 import os
 import queue
 import threading
@@ -17,13 +18,11 @@ import numpy as np
 from ..utils.config import config_manager
 from ..utils.logging import logger
 
-# Try to import sentence-transformers, but have a fallback if not available
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
+# sentence-transformers (and torch) are slow to import, so only check that
+# they are installed here and import them when the model is first loaded
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
     logger.warning("sentence-transformers not available. Using dummy embedding model.")
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
 
 
 class EmbeddingService:
@@ -78,6 +77,8 @@ class EmbeddingService:
                 self.initialized = True
                 return True
             
+            from sentence_transformers import SentenceTransformer
+            
             # Determine the device
             device = "cpu"  # Default to CPU
             if self.use_gpu:
@@ -405,12 +405,14 @@ def handle_get_conversations_list(request: Dict[str, Any]) -> Dict[str, Any]:
     limit = request.get("limit", 10)
     scope = request.get("scope")
     include_messages = request.get("include_messages", False)
+    include_summaries = request.get("include_summaries", False)
     
     # Get the conversations list
     result = memory_service.get_conversations_list(
         limit=limit,
         scope=scope,
-        include_messages=include_messages
+        include_messages=include_messages,
+        include_summaries=include_summaries
     )
     
     return result
@@ -6,14 +6,20 @@ communicates with Claude Desktop via stdin/stdout, handling memory-related
 commands.
 """
 
+import itertools
 import json
 import sys
 import threading
 import time
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Union
 
 from ..utils.logging import logger
 
+# Shared responses for request errors that carry no per-request detail.
+# These are returned as-is, so callers must treat responses as read-only.
+_ERR_MISSING_ACTION: Dict[str, Any] = {"status": "error", "error": "Missing 'action' in request"}
+_ERR_INVALID_JSON: Dict[str, Any] = {"status": "error", "error": "Invalid JSON in request"}
+
 
 class CircuitBreaker:
     """
@@ -49,18 +55,25 @@ class CircuitBreaker:
         Returns:
             True if the circuit is open (command should not be executed)
         """
-        with self.lock:
-            # If circuit was open, check if we can try again
-            if self.circuit_open.get(command, False):
-                last_failure = self.last_failure_time.get(command, 0)
-                if time.time() - last_failure > self.reset_timeout:
-                    # Reset the circuit to half-open state
-                    self.circuit_open[command] = False
-                    self.failure_count[command] = 0
-                    logger.info(f"Circuit reset for command: {command}")
-                    return False
-                return True
+        # Fast path without the lock: a single dict.get is atomic under the
+        # GIL, and a closed circuit (the common case) needs nothing else
+        if not self.circuit_open.get(command, False):
             return False
+        
+        with self.lock:
+            # Re-check under the lock, another thread may have reset it
+            if not self.circuit_open.get(command, False):
+                return False
+            
+            # Circuit is open, check if we can try again
+            last_failure = self.last_failure_time.get(command, 0)
+            if time.time() - last_failure > self.reset_timeout:
+                # Reset the circuit to half-open state
+                self.circuit_open[command] = False
+                self.failure_count[command] = 0
+                logger.info(f"Circuit reset for command: {command}")
+                return False
+            return True
     
     def record_success(self, command: str) -> None:
         """
@@ -101,6 +114,11 @@ class MCPServer:
     parsing MCP commands and dispatching them to the appropriate handlers.
     """
     
+    # Initial size of the stdin receive buffer; it doubles when a request
+    # does not fit, up to MAX_REQUEST_SIZE, and shrinks back once drained.
+    RECV_BUFFER_SIZE = 64 * 1024
+    MAX_REQUEST_SIZE = 16 * 1024 * 1024
+    
     def __init__(self):
         """Initialize the MCP server."""
         self.command_handlers: Dict[str, Callable] = {}
@@ -114,13 +132,35 @@ class MCPServer:
         
         # Metrics
         self.request_count = 0
-        self.error_count = 0
+        # Errors are counted lock-free with itertools.count, whose increment
+        # is a single C call and so never hands two threads the same number.
+        # Storing the result is a separate step, so a thread that stores late
+        # can briefly leave error_count lagging; that is acceptable for a
+        # health metric
+        self._error_counter = itertools.count(1)
+        self._errors_seen = 0
         self.slow_request_threshold = 1.0  # seconds
         self.slow_request_count = 0
         
         # Health check
         self.health_status = "ok"
         self.last_error: Optional[str] = None
+        
+        # Stdin receive buffer; bytes between _recv_start and _recv_end
+        # have been read but not yet returned as a request
+        self._recv_buf = bytearray(self.RECV_BUFFER_SIZE)
+        self._recv_start = 0
+        self._recv_end = 0
+        self._recv_discarding = False
+    
+    @property
+    def error_count(self) -> int:
+        """Number of requests that have ended in an error."""
+        return self._errors_seen
+    
+    def _record_error(self) -> None:
+        """Count a failed request."""
+        self._errors_seen = next(self._error_counter)
     
     def register_command(self, action: str, handler: Callable) -> None:
         """
@@ -133,12 +173,12 @@ class MCPServer:
         self.command_handlers[action] = handler
         logger.info(f"Registered handler for MCP command: {action}")
     
-    def process_request(self, request_json: str) -> Optional[Dict[str, Any]]:
+    def process_request(self, request_json: Union[str, bytes, bytearray]) -> Optional[Dict[str, Any]]:
         """
         Process an MCP request.
         
         Args:
-            request_json: The JSON string containing the MCP request
+            request_json: The JSON text (str or UTF-8 bytes) containing the MCP request
             
         Returns:
             A dict containing the response, or None if an error occurred
@@ -153,13 +193,13 @@ class MCPServer:
             action = request.get("action")
             if not action:
                 logger.error("Missing 'action' in MCP request")
-                self.error_count += 1
-                return {"status": "error", "error": "Missing 'action' in request"}
+                self._record_error()
+                return _ERR_MISSING_ACTION
             
             # Check if circuit breaker is open for this command
             if self.circuit_breaker.is_open(action):
                 logger.warning(f"Circuit breaker open for {action}, rejecting request")
-                self.error_count += 1
+                self._record_error()
                 return {
                     "status": "error", 
                     "error": f"Service temporarily unavailable for action: {action}",
@@ -170,7 +210,7 @@ class MCPServer:
             handler = self.command_handlers.get(action)
             if not handler:
                 logger.error(f"Unknown action: {action}")
-                self.error_count += 1
+                self._record_error()
                 return {"status": "error", "error": f"Unknown action: {action}"}
             
             # Process the command with retry logic
@@ -178,12 +218,12 @@ class MCPServer:
             
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in MCP request: {e}")
-            self.error_count += 1
-            return {"status": "error", "error": "Invalid JSON in request"}
+            self._record_error()
+            return _ERR_INVALID_JSON
         
         except Exception as e:
             logger.exception(f"Error processing MCP request: {e}")
-            self.error_count += 1
+            self._record_error()
             self.health_status = "degraded"
             self.last_error = str(e)
             return {"status": "error", "error": str(e)}
@@ -243,7 +283,7 @@ class MCPServer:
                     self.last_error = last_error
         
         # All retries failed
-        self.error_count += 1
+        self._record_error()
         return {
             "status": "error",
             "error": f"Command failed after {attempts} attempts: {last_error}"
@@ -289,6 +329,72 @@ class MCPServer:
             "last_error": self.last_error
         }
     
+    def _read_request(self, stream: BinaryIO) -> Optional[bytearray]:
+        """
+        Read the next newline-delimited request from a binary stream.
+        
+        Data is read into a shared receive buffer, so several requests that
+        arrive together are served from a single read. The buffer doubles
+        when a request does not fit, up to MAX_REQUEST_SIZE; larger requests
+        are discarded up to their terminating newline. A grown buffer is
+        returned to RECV_BUFFER_SIZE once it has been drained.
+        
+        Args:
+            stream: The stream to read from (normally sys.stdin.buffer)
+            
+        Returns:
+            The request bytes without the newline, or None at end of stream
+            
+        Raises:
+            ValueError: If a request exceeds MAX_REQUEST_SIZE
+        """
+        while True:
+            if (self._recv_start == self._recv_end
+                    and len(self._recv_buf) > self.RECV_BUFFER_SIZE):
+                # Don't hold on to the memory a large request needed
+                self._recv_buf = bytearray(self.RECV_BUFFER_SIZE)
+                self._recv_start = self._recv_end = 0
+            
+            buf = self._recv_buf
+            newline = buf.find(b"\n", self._recv_start, self._recv_end)
+            
+            if newline >= 0:
+                start = self._recv_start
+                self._recv_start = newline + 1
+                if self._recv_discarding:
+                    self._recv_discarding = False
+                    continue
+                return buf[start:newline]
+            
+            if self._recv_discarding:
+                # Still inside an oversized request; drop what we have
+                self._recv_start = self._recv_end = 0
+            elif self._recv_start > 0:
+                # Move the partial request to the front of the buffer
+                pending = self._recv_end - self._recv_start
+                buf[:pending] = buf[self._recv_start:self._recv_end]
+                self._recv_start, self._recv_end = 0, pending
+            
+            if self._recv_end == len(buf):
+                if len(buf) >= self.MAX_REQUEST_SIZE:
+                    self._recv_start = self._recv_end = 0
+                    self._recv_discarding = True
+                    raise ValueError(
+                        f"Request exceeds maximum size of {self.MAX_REQUEST_SIZE} bytes"
+                    )
+                buf.extend(bytes(min(len(buf), self.MAX_REQUEST_SIZE - len(buf))))
+            
+            count = stream.readinto1(memoryview(buf)[self._recv_end:])
+            if not count:
+                # End of stream; hand back any unterminated request
+                start, end = self._recv_start, self._recv_end
+                self._recv_start = self._recv_end = 0
+                if end > start and not self._recv_discarding:
+                    return buf[start:end]
+                self._recv_discarding = False
+                return None
+            self._recv_end += count
+    
     def _run_server(self) -> None:
         """
         Run the MCP server loop, reading from stdin and writing to stdout.
@@ -301,7 +407,12 @@ class MCPServer:
         while self.running:
             try:
                 # Read a line from stdin
-                request_json = sys.stdin.readline().strip()
+                request_json = self._read_request(sys.stdin.buffer)
+                if request_json is None:
+                    logger.info("MCP server input closed")
+                    self.running = False
+                    break
+                request_json = request_json.strip()
                 
                 # Skip empty lines
                 if not request_json:
@@ -333,7 +444,7 @@ class MCPServer:
                 # Update health status
                 self.health_status = "degraded"
                 self.last_error = str(e)
-                self.error_count += 1
+                self._record_error()
         
         logger.info("MCP server loop ended")
 
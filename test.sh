@@ -1,4 +1,6 @@
 #!/bin/bash
 
+# Extra arguments are passed on to pytest, e.g. ./test.sh -n auto --dist=loadfile
+# to run the tests in parallel with pytest-xdist
 clear
-python3 -m pytest
\ No newline at end of file
+python3 -m pytest "$@"
\ No newline at end of file
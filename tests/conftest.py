@@ -0,0 +1,81 @@
+"""
+Shared pytest fixtures for the InfiniteMemoryMCP test suite.
+"""
+
+import copy
+import logging
+import os
+
+import pytest
+
+from src.infinite_memory_mcp.utils.config import DEFAULT_CONFIG, config_manager
+
+# Run the tests against a private copy of the default configuration rather
+# than any config.json found on the machine. This has to happen before the
+# imports below, whose singletons read the config when they are created.
+config_manager.config = copy.deepcopy(DEFAULT_CONFIG)
+config_manager.config_path = None
+
+from src.infinite_memory_mcp.db.mongo_manager import mongo_manager  # noqa: E402
+from src.infinite_memory_mcp.embedding.embedding_service import embedding_service  # noqa: E402
+
+# Keep log records out of the console and log file while testing
+logging.disable(logging.CRITICAL)
+
+# Use the dummy embedding model unless IMM_REAL_EMBEDDINGS=1. This has to
+# happen before any test module imports memory_service, whose singleton
+# initializes the embedding service (and loads the real model) on import.
+if os.environ.get("IMM_REAL_EMBEDDINGS") != "1":
+    embedding_service._is_test_environment = True
+
+# Import the command handlers (and the services they pull in) once here, after
+# the flag above is set, so test modules importing them reuse the loaded modules
+import src.infinite_memory_mcp.mcp.commands  # noqa: E402,F401
+
+
+def pytest_addoption(parser):
+    """Add the option that enables the integration tests."""
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        default=False,
+        help="run tests marked as integration"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip integration tests unless --run-integration was given."""
+    if config.getoption("--run-integration"):
+        return
+
+    skip_integration = pytest.mark.skip(reason="use --run-integration to run")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
+
+
+@pytest.fixture(scope="session")
+def embeddings():
+    """Initialize the embedding service once for the whole session."""
+    embedding_service.initialize()
+    return embedding_service
+
+
+@pytest.fixture(scope="session")
+def mongo():
+    """
+    Connect mongo_manager to an in-process mongomock database once for the
+    whole session.
+
+    Yields:
+        The mongomock database used by mongo_manager
+    """
+    mongomock = pytest.importorskip("mongomock")
+
+    # Inject the client instead of starting mongod
+    mongo_manager.attach_client(mongomock.MongoClient(), "claude_memory_test")
+
+    yield mongo_manager.db
+
+    # Disconnect
+    mongo_manager.stop()
@@ -2,7 +2,6 @@
 Tests for asynchronous embedding functionality.
 """
 
-import time
 import unittest
 from typing import List
 from unittest.mock import MagicMock, patch
@@ -65,13 +64,10 @@ class TestAsyncEmbedding(unittest.TestCase):
         self.assertEqual(embedding1, [0.1, 0.2, 0.3, 0.4])
         self.service._generate_embedding_internal.assert_called_once_with("cached text")
         
-        # Reset the mock to verify it's not called again
-        self.service._generate_embedding_internal.reset_mock()
-        
-        # Second call should use the cache
+        # Second call should use the cache, so the call count stays at one
         embedding2 = self.service.generate_embedding("cached text")
         self.assertEqual(embedding2, [0.1, 0.2, 0.3, 0.4])
-        self.service._generate_embedding_internal.assert_not_called()
+        self.assertEqual(self.service._generate_embedding_internal.call_count, 1)
     
     def test_async_worker_queue(self):
         """Test the async worker queue processing."""
@@ -98,12 +94,10 @@ class TestAsyncEmbedding(unittest.TestCase):
                     f"text{i}", callback, f"arg{i}", kwarg=f"value{i}"
                 )
             
-            # Wait for all embeddings to be processed
+            # Wait for all embeddings to be processed; the worker runs the
+            # callbacks before marking each task done
             self.service.embedding_queue.join()
             
-            # Give the callbacks time to execute
-            time.sleep(0.1)
-            
             # Verify all callbacks were executed
             self.assertEqual(len(callback_results), 3)
             
@@ -5,10 +5,11 @@ This module tests the conversation history storage, retrieval, and summarization
 features of InfiniteMemoryMCP.
 """
 
+import importlib
 import json
 import unittest
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call
 
 from src.infinite_memory_mcp.core.memory_service import memory_service
 from src.infinite_memory_mcp.core.models import ConversationMemory, SummaryMemory
@@ -18,15 +19,21 @@ from src.infinite_memory_mcp.mcp.commands import (
     handle_store_conversation_history
 )
 
+# The core package re-exports the memory_service singleton under the same
+# name as its module, so look the module itself up to swap its repository
+memory_service_module = importlib.import_module("src.infinite_memory_mcp.core.memory_service")
+
 
 class TestConversationHistory(unittest.TestCase):
     """Tests for conversation history functionality."""
 
     def setUp(self):
         """Set up test fixtures."""
-        # Create a patch for the memory repository
-        self.memory_repository_patch = patch('src.infinite_memory_mcp.core.memory_service.memory_repository')
-        self.mock_memory_repository = self.memory_repository_patch.start()
+        # Swap in a mock memory repository, restoring the real one afterwards
+        self.mock_memory_repository = MagicMock()
+        self.addCleanup(setattr, memory_service_module, "memory_repository",
+                        memory_service_module.memory_repository)
+        memory_service_module.memory_repository = self.mock_memory_repository
         
         # Mock the store_conversation_batch method
         self.mock_memory_repository.store_conversation_batch.return_value = {
@@ -69,10 +76,6 @@ class TestConversationHistory(unittest.TestCase):
         ]
         self.mock_memory_repository.get_conversations_list.return_value = test_conversations
     
-    def tearDown(self):
-        """Tear down test fixtures."""
-        self.memory_repository_patch.stop()
-    
     def test_store_conversation_history(self):
         """Test storing a conversation history batch."""
         # Create test request
@@ -120,11 +123,12 @@ class TestConversationHistory(unittest.TestCase):
         self.assertEqual(response["messages"][1]["speaker"], "assistant")
         
         # Verify the repository was called correctly
-        self.mock_memory_repository.get_conversation_history.assert_called_once_with(
+        self.assertEqual(self.mock_memory_repository.get_conversation_history.call_count, 1)
+        self.assertEqual(self.mock_memory_repository.get_conversation_history.call_args, call(
             conversation_id="test-conversation-id",
             limit=10,
             offset=0
-        )
+        ))
     
     def test_get_conversations_list(self):
         """Test retrieving the list of conversations."""
@@ -153,11 +157,58 @@ class TestConversationHistory(unittest.TestCase):
         self.assertTrue("preview_messages" in response["conversations"][0])
         
         # Verify the repository was called correctly
-        self.mock_memory_repository.get_conversations_list.assert_called_once_with(
+        self.assertEqual(self.mock_memory_repository.get_conversations_list.call_count, 1)
+        self.assertEqual(self.mock_memory_repository.get_conversations_list.call_args, call(
             limit=5,
             scope="TestScope",
             include_messages=True
-        )
+        ))
+    
+    def test_get_conversations_list_with_summaries(self):
+        """Test that summaries for a conversations list are fetched in one query."""
+        self.mock_memory_repository.get_conversations_list.return_value = [
+            {
+                "_id": conv_id,
+                "conversation_id": conv_id,
+                "first_timestamp": datetime.now() - timedelta(minutes=10),
+                "last_timestamp": datetime.now() - timedelta(minutes=1),
+                "message_count": 2,
+                "scope": "TestScope",
+                "first_message": {"text": "Hello, Claude!", "speaker": "user"}
+            }
+            for conv_id in ["conv-1", "conv-2", "conv-3"]
+        ]
+        self.mock_memory_repository.get_summaries_for_conversations.return_value = {
+            "conv-2": [
+                SummaryMemory(
+                    id="summary-id-2",
+                    conversation_id="conv-2",
+                    summary_text="Second conversation summary.",
+                    scope="TestScope"
+                )
+            ]
+        }
+        
+        # Call the handler
+        response = handle_get_conversations_list({
+            "scope": "TestScope",
+            "include_summaries": True
+        })
+        
+        # Check the response
+        self.assertEqual(response["status"], "OK")
+        self.assertEqual(response["count"], 3)
+        summaries = {conv["conversation_id"]: conv["summaries"] for conv in response["conversations"]}
+        self.assertEqual(summaries["conv-1"], [])
+        self.assertEqual(summaries["conv-2"][0]["summary_id"], "summary-id-2")
+        self.assertEqual(summaries["conv-3"], [])
+        
+        # Verify summaries were fetched once for all conversations
+        self.assertEqual(self.mock_memory_repository.get_summaries_for_conversations.call_count, 1)
+        self.assertEqual(self.mock_memory_repository.get_summaries_for_conversations.call_args, call(
+            ["conv-1", "conv-2", "conv-3"]
+        ))
+        self.mock_memory_repository.get_summaries_by_conversation.assert_not_called()
 
 
 class TestConversationSummary(unittest.TestCase):
@@ -165,9 +216,11 @@ class TestConversationSummary(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
-        # Create a patch for the memory repository
-        self.memory_repository_patch = patch('src.infinite_memory_mcp.core.memory_service.memory_repository')
-        self.mock_memory_repository = self.memory_repository_patch.start()
+        # Swap in a mock memory repository, restoring the real one afterwards
+        self.mock_memory_repository = MagicMock()
+        self.addCleanup(setattr, memory_service_module, "memory_repository",
+                        memory_service_module.memory_repository)
+        memory_service_module.memory_repository = self.mock_memory_repository
         
         # Mock the get_conversation_history method for summarization
         test_memories = [
@@ -211,10 +264,6 @@ class TestConversationSummary(unittest.TestCase):
         self.mock_memory_repository.get_summaries_by_conversation.return_value = test_summaries
         self.mock_memory_repository.get_latest_conversation_summaries.return_value = test_summaries
     
-    def tearDown(self):
-        """Tear down test fixtures."""
-        self.memory_repository_patch.stop()
-    
     def test_create_conversation_summary_auto_generate(self):
         """Test creating a conversation summary with auto-generation."""
         # Create test request
@@ -234,9 +283,10 @@ class TestConversationSummary(unittest.TestCase):
         self.assertTrue(response["generated"])
         
         # Verify the repository was called correctly
-        self.mock_memory_repository.get_conversation_history.assert_called_once_with(
+        self.assertEqual(self.mock_memory_repository.get_conversation_history.call_count, 1)
+        self.assertEqual(self.mock_memory_repository.get_conversation_history.call_args, call(
             "test-conversation-id"
-        )
+        ))
         self.mock_memory_repository.store_summary.assert_called_once()
     
     def test_create_conversation_summary_with_provided_text(self):
@@ -280,9 +330,10 @@ class TestConversationSummary(unittest.TestCase):
         self.assertEqual(response["summaries"][0]["scope"], "TestScope")
         
         # Verify the repository was called correctly
-        self.mock_memory_repository.get_summaries_by_conversation.assert_called_once_with(
+        self.assertEqual(self.mock_memory_repository.get_summaries_by_conversation.call_count, 1)
+        self.assertEqual(self.mock_memory_repository.get_summaries_by_conversation.call_args, call(
             "test-conversation-id"
-        )
+        ))
     
     def test_get_latest_conversation_summaries(self):
         """Test getting the latest conversation summaries."""
@@ -301,10 +352,11 @@ class TestConversationSummary(unittest.TestCase):
         self.assertEqual(response["summaries"][0]["summary_id"], "summary-id-1")
         
         # Verify the repository was called correctly
-        self.mock_memory_repository.get_latest_conversation_summaries.assert_called_once_with(
+        self.assertEqual(self.mock_memory_repository.get_latest_conversation_summaries.call_count, 1)
+        self.assertEqual(self.mock_memory_repository.get_latest_conversation_summaries.call_args, call(
             limit=10,
             scope="TestScope"
-        )
+        ))
 
 
 if __name__ == "__main__":
@@ -2,18 +2,13 @@
 Test the MCP server functionality.
 """
 
+import io
 import json
 import threading
 import time
 import unittest
 from unittest.mock import MagicMock, patch
 
-import sys
-import os
-
-# Add the src directory to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from src.infinite_memory_mcp.mcp.mcp_server import MCPServer
 from src.infinite_memory_mcp.mcp.commands import handle_ping
 
@@ -75,6 +70,61 @@ class TestMCPServer(unittest.TestCase):
         self.assertEqual(response["status"], "error")
         self.assertIn("Missing 'action'", response["error"])
 
+    
+    def test_process_request_bytes(self):
+        """Test processing a request passed as bytes."""
+        request = json.dumps({"action": "ping", "message": "bytes"}).encode("utf-8")
+        
+        response = self.server.process_request(request)
+        
+        self.assertEqual(response["status"], "OK")
+        self.assertEqual(response["echo"], "bytes")
+    
+    def test_read_request_frames(self):
+        """Test splitting buffered stdin data into newline-delimited requests."""
+        stream = io.BytesIO(b'{"action": "ping"}\n\n{"action": "other"}\n{"tail": 1}')
+        
+        self.assertEqual(self.server._read_request(stream), b'{"action": "ping"}')
+        self.assertEqual(self.server._read_request(stream), b'')
+        self.assertEqual(self.server._read_request(stream), b'{"action": "other"}')
+        self.assertEqual(self.server._read_request(stream), b'{"tail": 1}')
+        self.assertIsNone(self.server._read_request(stream))
+    
+    def test_read_request_grows_buffer(self):
+        """Test that a request larger than the receive buffer is read whole."""
+        self.server.RECV_BUFFER_SIZE = 8
+        self.server._recv_buf = bytearray(8)
+        payload = json.dumps({"action": "ping", "message": "x" * 100}).encode("utf-8")
+        stream = io.BytesIO(payload + b"\n" + b'{"action": "ping"}\n')
+        
+        self.assertEqual(self.server._read_request(stream), payload)
+        self.assertGreaterEqual(len(self.server._recv_buf), len(payload))
+        
+        # The buffer shrinks back once the large request has been drained
+        self.assertEqual(self.server._read_request(stream), b'{"action": "ping"}')
+        self.assertIsNone(self.server._read_request(stream))
+        self.assertEqual(len(self.server._recv_buf), 8)
+    
+    def test_read_request_too_large(self):
+        """Test that an oversized request is rejected and skipped."""
+        self.server.MAX_REQUEST_SIZE = 16
+        self.server._recv_buf = bytearray(8)
+        stream = io.BytesIO(b"x" * 40 + b'\n{"action": "ping"}\n')
+        
+        with self.assertRaises(ValueError):
+            self.server._read_request(stream)
+        self.server.MAX_REQUEST_SIZE = 64
+        self.assertEqual(self.server._read_request(stream), b'{"action": "ping"}')
+    
+    def test_read_request_size_limit_is_exact(self):
+        """Test that the buffer never grows past MAX_REQUEST_SIZE."""
+        self.server.MAX_REQUEST_SIZE = 20
+        self.server._recv_buf = bytearray(8)
+        stream = io.BytesIO(b"x" * 25 + b"\n")
+        
+        with self.assertRaises(ValueError):
+            self.server._read_request(stream)
+
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -2,10 +2,13 @@
 Tests for the memory MCP commands.
 """
 
-import json
-import unittest
-from unittest.mock import MagicMock, patch
+import inspect
+from collections import defaultdict
 
+import pytest
+
+from src.infinite_memory_mcp.core.memory_service import MemoryService
+from src.infinite_memory_mcp.mcp import commands
 from src.infinite_memory_mcp.mcp.commands import (handle_delete_memory,
                                                  handle_get_memory_stats,
                                                  handle_retrieve_memory,
@@ -13,307 +16,296 @@ from src.infinite_memory_mcp.mcp.commands import (handle_delete_memory,
                                                  handle_search_by_tag,
                                                  handle_store_memory)
 
+# Request skeletons shared by the tests; each test adds its own fields on
+# top of a shallow copy, e.g. {**_BASE_STORE_REQ, "content": ...}
+_BASE_STORE_REQ = {
+    "action": "store_memory",
+    "metadata": {
+        "scope": "TestScope",
+        "tags": ["test", "memory"],
+        "source": "test",
+        "conversation_id": "test_convo",
+        "speaker": "user"
+    }
+}
+_BASE_RETRIEVE_REQ = {
+    "action": "retrieve_memory",
+    "filter": {
+        "scope": "TestScope",
+        "tags": ["test"],
+        "time_range": {"from": "2023-01-01", "to": "2023-01-02"}
+    }
+}
+_BASE_DELETE_REQ = {
+    "action": "delete_memory",
+    "target": {},
+    "forget_mode": "soft"
+}
 
-class TestMemoryCommands(unittest.TestCase):
-    """Test cases for the memory MCP commands."""
-    
-    def setUp(self):
-        """Set up the test case."""
-        self.mock_memory_service = MagicMock()
-        
-        # Create patcher for memory_service
-        self.memory_service_patcher = patch(
-            'src.infinite_memory_mcp.mcp.commands.memory_service',
-            self.mock_memory_service
-        )
-        self.memory_service_patcher.start()
-    
-    def tearDown(self):
-        """Clean up after the test."""
-        self.memory_service_patcher.stop()
-    
-    def test_store_memory_command(self):
-        """Test the store_memory command."""
-        # Setup mock service
-        expected_response = {
-            "status": "OK",
-            "memory_id": "mock_id",
-            "scope": "TestScope"
-        }
-        self.mock_memory_service.store_memory.return_value = expected_response
-        
-        # Create request
-        request = {
-            "action": "store_memory",
-            "content": "Test memory content",
-            "metadata": {
-                "scope": "TestScope",
-                "tags": ["test", "memory"],
-                "source": "test",
-                "conversation_id": "test_convo",
-                "speaker": "user"
-            }
-        }
-        
-        # Execute command
-        response = handle_store_memory(request)
-        
-        # Verify service was called correctly
-        self.mock_memory_service.store_memory.assert_called_once_with(
-            content="Test memory content",
-            scope="TestScope",
-            tags=["test", "memory"],
-            source="test",
-            conversation_id="test_convo",
-            speaker="user"
-        )
-        
-        # Verify response
-        self.assertEqual(response, expected_response)
-    
-    def test_store_memory_missing_content(self):
-        """Test the store_memory command with missing content."""
-        # Create request without content
-        request = {
-            "action": "store_memory",
-            "metadata": {
-                "scope": "TestScope"
-            }
-        }
-        
-        # Execute command
-        response = handle_store_memory(request)
-        
-        # Verify service was not called
-        self.mock_memory_service.store_memory.assert_not_called()
-        
-        # Verify error response
-        self.assertEqual(response["status"], "error")
-        self.assertIn("Missing required 'content' field", response["error"])
-    
-    def test_retrieve_memory_command(self):
-        """Test the retrieve_memory command."""
-        # Setup mock service
-        expected_response = {
-            "status": "OK",
-            "results": [
-                {
-                    "text": "Test memory",
-                    "source": "conversation",
-                    "timestamp": "2023-01-01T00:00:00",
-                    "scope": "TestScope",
-                    "tags": ["test"],
-                    "confidence": 1.0,
-                    "memory_id": "mock_id"
-                }
-            ]
-        }
-        self.mock_memory_service.retrieve_memory.return_value = expected_response
-        
-        # Create request
-        request = {
-            "action": "retrieve_memory",
-            "query": "test memory",
-            "filter": {
-                "scope": "TestScope",
-                "tags": ["test"],
-                "time_range": {"from": "2023-01-01", "to": "2023-01-02"}
-            },
-            "top_k": 3
-        }
-        
-        # Execute command
-        response = handle_retrieve_memory(request)
-        
-        # Verify service was called correctly
-        self.mock_memory_service.retrieve_memory.assert_called_once_with(
-            query="test memory",
-            scope="TestScope",
-            tags=["test"],
-            time_range={"from": "2023-01-01", "to": "2023-01-02"},
-            top_k=3
-        )
-        
-        # Verify response
-        self.assertEqual(response, expected_response)
-    
-    def test_retrieve_memory_missing_query(self):
-        """Test the retrieve_memory command with missing query."""
-        # Create request without query
-        request = {
-            "action": "retrieve_memory",
-            "filter": {
-                "scope": "TestScope"
-            }
-        }
-        
-        # Execute command
-        response = handle_retrieve_memory(request)
-        
-        # Verify service was not called
-        self.mock_memory_service.retrieve_memory.assert_not_called()
-        
-        # Verify error response
-        self.assertEqual(response["status"], "error")
-        self.assertIn("Missing required 'query' field", response["error"])
-    
-    def test_search_by_tag_command(self):
-        """Test the search_by_tag command."""
-        # Setup mock service
-        expected_response = {
-            "status": "OK",
-            "results": [
-                {
-                    "text": "Tagged memory",
-                    "source": "conversation",
-                    "timestamp": "2023-01-01T00:00:00",
-                    "scope": "TestScope",
-                    "tags": ["important"],
-                    "confidence": 1.0,
-                    "memory_id": "mock_id"
-                }
-            ]
-        }
-        self.mock_memory_service.search_by_tag.return_value = expected_response
-        
-        # Create request
-        request = {
-            "action": "search_by_tag",
-            "tag": "important",
-            "query": "meeting"
-        }
-        
-        # Execute command
-        response = handle_search_by_tag(request)
-        
-        # Verify service was called correctly
-        self.mock_memory_service.search_by_tag.assert_called_once_with(
-            tag="important",
-            query="meeting"
-        )
-        
-        # Verify response
-        self.assertEqual(response, expected_response)
-    
-    def test_search_by_scope_command(self):
-        """Test the search_by_scope command."""
-        # Setup mock service
-        expected_response = {
+
+class StubMemoryService:
+    """
+    Stand-in for the memory service used by the command handlers.
+    
+    Each method records its (args, kwargs) in ``calls`` and returns the
+    value preset for it in ``ret``. Calls are checked against the real
+    MemoryService signature, so a handler passing an unknown or missing
+    argument fails the test.
+    """
+    
+    def __init__(self):
+        """Initialize an empty stub."""
+        self.calls = defaultdict(list)
+        self.ret = {}
+    
+    def _record(self, method, args, kwargs):
+        # Raises TypeError if the call does not match the real method
+        inspect.signature(getattr(MemoryService, method)).bind(self, *args, **kwargs)
+        self.calls[method].append((args, kwargs))
+        return self.ret.get(method)
+    
+    def store_memory(self, *args, **kwargs):
+        return self._record("store_memory", args, kwargs)
+    
+    def retrieve_memory(self, *args, **kwargs):
+        return self._record("retrieve_memory", args, kwargs)
+    
+    def search_by_tag(self, *args, **kwargs):
+        return self._record("search_by_tag", args, kwargs)
+    
+    def search_by_scope(self, *args, **kwargs):
+        return self._record("search_by_scope", args, kwargs)
+    
+    def delete_memory(self, *args, **kwargs):
+        return self._record("delete_memory", args, kwargs)
+    
+    def get_memory_stats(self, *args, **kwargs):
+        return self._record("get_memory_stats", args, kwargs)
+
+
+@pytest.fixture
+def stub_service(monkeypatch):
+    """Replace the memory service used by the command handlers with a stub."""
+    stub = StubMemoryService()
+    monkeypatch.setattr(commands, "memory_service", stub)
+    return stub
+
+
+@pytest.fixture
+def make_result():
+    """Return a factory for a successful single-result service response."""
+    def _make_result(text="Test memory", scope="TestScope", tags=("test",), **overrides):
+        return {
             "status": "OK",
             "results": [
                 {
-                    "text": "Scoped memory",
+                    "text": text,
                     "source": "conversation",
                     "timestamp": "2023-01-01T00:00:00",
-                    "scope": "ProjectAlpha",
-                    "tags": [],
+                    "scope": scope,
+                    "tags": list(tags),
                     "confidence": 1.0,
-                    "memory_id": "mock_id"
+                    "memory_id": "mock_id",
+                    **overrides
                 }
             ]
         }
-        self.mock_memory_service.search_by_scope.return_value = expected_response
-        
-        # Create request
-        request = {
-            "action": "search_by_scope",
-            "scope": "ProjectAlpha",
-            "query": "meeting"
-        }
-        
-        # Execute command
-        response = handle_search_by_scope(request)
-        
-        # Verify service was called correctly
-        self.mock_memory_service.search_by_scope.assert_called_once_with(
-            scope="ProjectAlpha",
-            query="meeting"
-        )
-        
-        # Verify response
-        self.assertEqual(response, expected_response)
-    
-    def test_delete_memory_command(self):
-        """Test the delete_memory command."""
-        # Setup mock service
-        expected_response = {
-            "status": "OK",
-            "deleted_count": 1,
-            "scope": None,
-            "note": "Deleted 1 memories"
-        }
-        self.mock_memory_service.delete_memory.return_value = expected_response
-        
-        # Create request
-        request = {
-            "action": "delete_memory",
-            "target": {
-                "memory_id": "mock_id"
-            },
-            "forget_mode": "soft"
-        }
-        
-        # Execute command
-        response = handle_delete_memory(request)
-        
-        # Verify service was called correctly
-        self.mock_memory_service.delete_memory.assert_called_once_with(
-            memory_id="mock_id",
-            scope=None,
-            tag=None,
-            query=None,
-            forget_mode="soft"
-        )
-        
-        # Verify response
-        self.assertEqual(response, expected_response)
-    
-    def test_delete_memory_missing_criteria(self):
-        """Test the delete_memory command with missing criteria."""
-        # Create request without criteria
-        request = {
-            "action": "delete_memory",
-            "target": {},
-            "forget_mode": "soft"
-        }
-        
-        # Execute command
-        response = handle_delete_memory(request)
-        
-        # Verify service was not called
-        self.mock_memory_service.delete_memory.assert_not_called()
-        
-        # Verify error response
-        self.assertEqual(response["status"], "error")
-        self.assertIn("At least one deletion criterion is required", response["error"])
-    
-    def test_get_memory_stats_command(self):
-        """Test the get_memory_stats command."""
-        # Setup mock service
-        expected_stats = {
-            "total_memories": 10,
-            "conversation_count": 2,
-            "scopes": {"Global": 5, "TestScope": 5},
-            "last_backup": None,
-            "db_size_mb": 1.5
-        }
-        self.mock_memory_service.get_memory_stats.return_value = expected_stats
-        
-        # Create request
-        request = {
-            "action": "get_memory_stats"
-        }
-        
-        # Execute command
-        response = handle_get_memory_stats(request)
-        
-        # Verify service was called correctly
-        self.mock_memory_service.get_memory_stats.assert_called_once()
-        
-        # Verify response
-        self.assertEqual(response["status"], "OK")
-        self.assertEqual(response["stats"], expected_stats)
+    return _make_result
+
+
+def test_store_memory_command(stub_service):
+    """Test the store_memory command."""
+    # Setup stub service
+    expected_response = {
+        "status": "OK",
+        "memory_id": "mock_id",
+        "scope": "TestScope"
+    }
+    stub_service.ret["store_memory"] = expected_response
+    
+    # Create request
+    request = {**_BASE_STORE_REQ, "content": "Test memory content"}
+    
+    # Execute command
+    response = handle_store_memory(request)
+    
+    # Verify service was called correctly
+    assert stub_service.calls["store_memory"] == [((), {
+        "content": "Test memory content",
+        "scope": "TestScope",
+        "tags": ["test", "memory"],
+        "source": "test",
+        "conversation_id": "test_convo",
+        "speaker": "user"
+    })]
+    
+    # Verify response
+    assert response == expected_response
+
+
+def test_retrieve_memory_command(stub_service, make_result):
+    """Test the retrieve_memory command."""
+    # Setup stub service
+    expected_response = make_result()
+    stub_service.ret["retrieve_memory"] = expected_response
+    
+    # Create request
+    request = {**_BASE_RETRIEVE_REQ, "query": "test memory", "top_k": 3}
+    
+    # Execute command
+    response = handle_retrieve_memory(request)
+    
+    # Verify service was called correctly
+    assert stub_service.calls["retrieve_memory"] == [((), {
+        "query": "test memory",
+        "scope": "TestScope",
+        "tags": ["test"],
+        "time_range": {"from": "2023-01-01", "to": "2023-01-02"},
+        "top_k": 3
+    })]
+    
+    # Verify response
+    assert response == expected_response
+
+
+def test_search_by_tag_command(stub_service, make_result):
+    """Test the search_by_tag command."""
+    # Setup stub service
+    expected_response = make_result(text="Tagged memory", tags=["important"])
+    stub_service.ret["search_by_tag"] = expected_response
+    
+    # Create request
+    request = {
+        "action": "search_by_tag",
+        "tag": "important",
+        "query": "meeting"
+    }
+    
+    # Execute command
+    response = handle_search_by_tag(request)
+    
+    # Verify service was called correctly
+    assert stub_service.calls["search_by_tag"] == [((), {
+        "tag": "important",
+        "query": "meeting"
+    })]
+    
+    # Verify response
+    assert response == expected_response
+
 
+def test_search_by_scope_command(stub_service, make_result):
+    """Test the search_by_scope command."""
+    # Setup stub service
+    expected_response = make_result(text="Scoped memory", scope="ProjectAlpha", tags=[])
+    stub_service.ret["search_by_scope"] = expected_response
+    
+    # Create request
+    request = {
+        "action": "search_by_scope",
+        "scope": "ProjectAlpha",
+        "query": "meeting"
+    }
+    
+    # Execute command
+    response = handle_search_by_scope(request)
+    
+    # Verify service was called correctly
+    assert stub_service.calls["search_by_scope"] == [((), {
+        "scope": "ProjectAlpha",
+        "query": "meeting"
+    })]
+    
+    # Verify response
+    assert response == expected_response
 
-if __name__ == "__main__":
-    unittest.main() 
\ No newline at end of file
+
+def test_delete_memory_command(stub_service):
+    """Test the delete_memory command."""
+    # Setup stub service
+    expected_response = {
+        "status": "OK",
+        "deleted_count": 1,
+        "scope": None,
+        "note": "Deleted 1 memories"
+    }
+    stub_service.ret["delete_memory"] = expected_response
+    
+    # Create request
+    request = {**_BASE_DELETE_REQ, "target": {"memory_id": "mock_id"}}
+    
+    # Execute command
+    response = handle_delete_memory(request)
+    
+    # Verify service was called correctly
+    assert stub_service.calls["delete_memory"] == [((), {
+        "memory_id": "mock_id",
+        "scope": None,
+        "tag": None,
+        "query": None,
+        "forget_mode": "soft"
+    })]
+    
+    # Verify response
+    assert response == expected_response
+
+
+def test_get_memory_stats_command(stub_service):
+    """Test the get_memory_stats command."""
+    # Setup stub service
+    expected_stats = {
+        "total_memories": 10,
+        "conversation_count": 2,
+        "scopes": {"Global": 5, "TestScope": 5},
+        "last_backup": None,
+        "db_size_mb": 1.5
+    }
+    stub_service.ret["get_memory_stats"] = expected_stats
+    
+    # Create request
+    request = {
+        "action": "get_memory_stats"
+    }
+    
+    # Execute command
+    response = handle_get_memory_stats(request)
+    
+    # Verify service was called correctly
+    assert stub_service.calls["get_memory_stats"] == [((), {})]
+    
+    # Verify response
+    assert response["status"] == "OK"
+    assert response["stats"] == expected_stats
+
+
+@pytest.mark.parametrize("handler,request_,method,message", [
+    (
+        handle_store_memory,
+        _BASE_STORE_REQ,
+        "store_memory",
+        "Missing required 'content' field"
+    ),
+    (
+        handle_retrieve_memory,
+        _BASE_RETRIEVE_REQ,
+        "retrieve_memory",
+        "Missing required 'query' field"
+    ),
+    (
+        handle_delete_memory,
+        _BASE_DELETE_REQ,
+        "delete_memory",
+        "At least one deletion criterion is required"
+    )
+], ids=["store_memory", "retrieve_memory", "delete_memory"])
+def test_missing_required_field(stub_service, handler, request_, method, message):
+    """Test that commands missing a required field are rejected."""
+    # Execute command
+    response = handler(request_)
+    
+    # Verify service was not called
+    assert stub_service.calls[method] == []
+    
+    # Verify error response
+    assert response["status"] == "error"
+    assert message in response["error"]
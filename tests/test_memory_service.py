@@ -2,288 +2,286 @@
 Tests for the memory service.
 """
 
-import time
-import unittest
+from dataclasses import replace
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, patch
 
 import pytest
 
 from src.infinite_memory_mcp.core.memory_service import MemoryService
-from src.infinite_memory_mcp.core.memory_repository import memory_repository
 from src.infinite_memory_mcp.core.models import ConversationMemory, MemoryScope
 
+# Fixed clock for the memory timestamps and time range filters
+FIXED_NOW = datetime(2024, 1, 1, 12, 0, 0)
 
-class TestMemoryService(unittest.TestCase):
-    """Test cases for the memory service."""
+# Config values read by MemoryService
+_CONFIG = {
+    "memory.default_scope": "Global",
+    "memory.auto_create_scope": True
+}
+
+# Read-only memories returned by the mocked repository
+_MEM1 = ConversationMemory(
+    id="memory1",
+    text="This is a test memory",
+    scope="TestScope",
+    tags=["test"],
+    timestamp=FIXED_NOW,
+    conversation_id="test_convo",
+    speaker="user"
+)
+_MEM2 = ConversationMemory(
+    id="memory2",
+    text="Another test memory",
+    scope="TestScope",
+    tags=["test", "another"],
+    timestamp=FIXED_NOW,
+    conversation_id="test_convo",
+    speaker="assistant"
+)
+_TAGGED_MEM = ConversationMemory(
+    id="memory1",
+    text="This is a tagged memory",
+    scope="TestScope",
+    tags=["important"],
+    timestamp=FIXED_NOW,
+    conversation_id="test_convo",
+    speaker="user"
+)
+
+# Search hits for the retrieve tests: one memory from now, one from yesterday
+_HITS = [
+    (_MEM1, 0.95),
+    (replace(_MEM2, timestamp=FIXED_NOW - timedelta(days=1)), 0.85)
+]
+
+# Results expected from retrieve_memory for each of the hits above
+_RETRIEVE_RESULTS = {
+    "memory1": {
+        "memory_id": "memory1",
+        "text": "This is a test memory",
+        "scope": "TestScope",
+        "tags": ["test"],
+        "timestamp": "2024-01-01T12:00:00",
+        "confidence": 0.95
+    },
+    "memory2": {
+        "memory_id": "memory2",
+        "text": "Another test memory",
+        "scope": "TestScope",
+        "tags": ["test", "another"],
+        "timestamp": "2023-12-31T12:00:00",
+        "confidence": 0.85
+    }
+}
+
+
+@pytest.fixture(scope="module")
+def service_env():
+    """
+    Patch the repository and config used by MemoryService once for the module.
+    
+    The service is built once and shared by all tests, which only reset the
+    mocks between them; a test that changes the service's attributes should
+    create its own MemoryService instead.
     
-    def setUp(self):
-        """Set up the test case."""
-        # Create a patch for the memory_repository in memory_service module
-        self.repo_patcher = patch('src.infinite_memory_mcp.core.memory_service.memory_repository')
-        # Start the patcher and get the mock object
-        self.mock_repo = self.repo_patcher.start()
-        
-        # Create a patch for config_manager
-        self.config_patcher = patch('src.infinite_memory_mcp.core.memory_service.config_manager')
-        # Start the patcher and get the mock object
-        self.mock_config = self.config_patcher.start()
-        
-        # Set up mock config behavior
-        self.mock_config.get.side_effect = self._mock_config_get
-        
-        # Create the service with our mocks
-        self.service = MemoryService()
+    Yields:
+        A (service, mock_repo, mock_config) tuple
+    """
+    with patch('src.infinite_memory_mcp.core.memory_service.memory_repository',
+               autospec=True) as mock_repo, \
+            patch('src.infinite_memory_mcp.core.memory_service.config_manager',
+                  autospec=True) as mock_config:
+        mock_config.get.side_effect = _CONFIG.get
+        yield MemoryService(), mock_repo, mock_config
+
+
+@pytest.fixture(autouse=True)
+def _reset_mocks(service_env):
+    """Clear calls and configured results left by the previous test."""
+    _, mock_repo, mock_config = service_env
+    mock_repo.reset_mock(return_value=True, side_effect=True)
+    mock_config.reset_mock(return_value=True, side_effect=True)
+    mock_config.get.side_effect = _CONFIG.get
+
+
+@pytest.mark.parametrize("content,scope,tags,source,kwargs,expected_scope", [
+    (
+        "Test memory content",
+        "TestScope",
+        ["test", "memory"],
+        "test",
+        {"conversation_id": "test_conversation", "speaker": "user"},
+        None
+    ),
+    (
+        "Test memory content",
+        "NewScope",
+        ["test"],
+        "test",
+        {},
+        "NewScope"
+    )
+], ids=["existing_scope", "auto_create_scope"])
+def test_store_memory(service_env, content, scope, tags, source, kwargs, expected_scope):
+    """Test storing a memory, creating its scope when it does not exist."""
+    service, mock_repo, _ = service_env
     
-    def tearDown(self):
-        """Clean up after the test."""
-        # Stop all patchers
-        self.repo_patcher.stop()
-        self.config_patcher.stop()
+    # Setup mock repository
+    mock_memory_id = "mock_memory_id"
+    mock_repo.store_conversation_memory.return_value = mock_memory_id
+    if expected_scope:
+        mock_repo.get_scope.return_value = None
+        mock_repo.create_scope.return_value = "mock_scope_id"
     
-    def _mock_config_get(self, key, default=None):
-        """Mock config_manager.get."""
-        config = {
-            "memory.default_scope": "Global",
-            "memory.auto_create_scope": True
-        }
-        return config.get(key, default)
+    # Call the service
+    result = service.store_memory(
+        content=content,
+        scope=scope,
+        tags=tags,
+        source=source,
+        **kwargs
+    )
     
-    def test_store_memory(self):
-        """Test storing a memory."""
-        # Setup mock repository
-        mock_memory_id = "mock_memory_id"
-        self.mock_repo.store_conversation_memory.return_value = mock_memory_id
-        
-        # Call the service
-        result = self.service.store_memory(
-            content="Test memory content",
-            scope="TestScope",
-            tags=["test", "memory"],
-            source="test",
-            conversation_id="test_conversation",
-            speaker="user"
-        )
-        
-        # Verify the repository was called correctly
-        self.mock_repo.store_conversation_memory.assert_called_once()
-        args, kwargs = self.mock_repo.store_conversation_memory.call_args
-        memory = args[0]
-        self.assertEqual(memory.text, "Test memory content")
-        self.assertEqual(memory.scope, "TestScope")
-        self.assertEqual(memory.tags, ["test", "memory"])
-        self.assertEqual(memory.conversation_id, "test_conversation")
-        self.assertEqual(memory.speaker, "user")
-        
-        # Verify the result
-        self.assertEqual(result["status"], "OK")
-        self.assertEqual(result["memory_id"], mock_memory_id)
-        self.assertEqual(result["scope"], "TestScope")
+    # Verify the scope was checked and only created when missing
+    mock_repo.get_scope.assert_called_once_with(scope)
+    if expected_scope:
+        mock_repo.create_scope.assert_called_once_with(MemoryScope(
+            scope_name=expected_scope,
+            description=f"Auto-created scope: {expected_scope}",
+            created_at=ANY
+        ))
+    else:
+        mock_repo.create_scope.assert_not_called()
     
-    def test_store_memory_auto_create_scope(self):
-        """Test storing a memory with auto-creating scope."""
-        # Setup mock repository
-        mock_memory_id = "mock_memory_id"
-        mock_scope_id = "mock_scope_id"
-        self.mock_repo.store_conversation_memory.return_value = mock_memory_id
-        self.mock_repo.get_scope.return_value = None
-        self.mock_repo.create_scope.return_value = mock_scope_id
-        
-        # Call the service
-        result = self.service.store_memory(
-            content="Test memory content",
-            scope="NewScope",
-            tags=["test"],
-            source="test"
-        )
-        
-        # Verify the scope was checked and created
-        self.mock_repo.get_scope.assert_called_once_with("NewScope")
-        self.mock_repo.create_scope.assert_called_once()
-        self.assertEqual(self.mock_repo.create_scope.call_args[0][0].scope_name, "NewScope")
-        
-        # Verify the memory was stored
-        self.mock_repo.store_conversation_memory.assert_called_once()
-        
-        # Verify the result
-        self.assertEqual(result["status"], "OK")
-        self.assertEqual(result["memory_id"], mock_memory_id)
-        self.assertEqual(result["scope"], "NewScope")
+    # Verify the repository was called correctly; the timestamp and any
+    # conversation ID not passed in are generated by the service
+    mock_repo.store_conversation_memory.assert_called_once_with(ConversationMemory(
+        conversation_id=kwargs.get("conversation_id", ANY),
+        speaker=kwargs.get("speaker", "user"),
+        text=content,
+        scope=scope,
+        tags=tags,
+        timestamp=ANY
+    ))
     
-    def test_retrieve_memory(self):
-        """Test retrieving memories by query."""
-        # Setup mock repository
-        mock_memories = [
-            ConversationMemory(
-                id="memory1",
-                text="This is a test memory",
-                scope="TestScope",
-                tags=["test"],
-                timestamp=datetime.now(),
-                conversation_id="test_convo",
-                speaker="user"
-            ),
-            ConversationMemory(
-                id="memory2",
-                text="Another test memory",
-                scope="TestScope",
-                tags=["test", "another"],
-                timestamp=datetime.now(),
-                conversation_id="test_convo",
-                speaker="assistant"
-            )
-        ]
-        self.mock_repo.perform_hybrid_search.return_value = [
-            (mock_memories[0], 0.95),
-            (mock_memories[1], 0.85)
-        ]
-        
-        # Call the service
-        result = self.service.retrieve_memory(
-            query="test memory",
-            scope="TestScope",
-            tags=["test"],
-            top_k=2
-        )
-        
-        # Verify the repository was called correctly
-        self.mock_repo.perform_hybrid_search.assert_called_once_with(
-            query_text="test memory", 
-            scope="TestScope", 
-            top_k=2, 
-            similarity_threshold=0.3
-        )
-        
-        # Verify the result
-        self.assertEqual(result["status"], "OK")
-        self.assertEqual(len(result["results"]), 2)
-        self.assertEqual(result["results"][0]["text"], "This is a test memory")
-        self.assertEqual(result["results"][0]["memory_id"], "memory1")
-        self.assertEqual(result["results"][1]["text"], "Another test memory")
-        self.assertEqual(result["results"][1]["memory_id"], "memory2")
+    # Verify the result
+    assert result == {"status": "OK", "memory_id": mock_memory_id, "scope": scope}
+
+
+@pytest.mark.parametrize("kwargs,top_k,expected_ids", [
+    (
+        {"tags": ["test"], "top_k": 2},
+        2,
+        ["memory1", "memory2"]
+    ),
+    (
+        {
+            # Only includes the memory from now
+            "time_range": {
+                "from": (FIXED_NOW - timedelta(hours=1)).isoformat(),
+                "to": (FIXED_NOW + timedelta(hours=1)).isoformat()
+            }
+        },
+        5,
+        ["memory1"]
+    )
+], ids=["no_time_range", "time_range"])
+def test_retrieve_memory(service_env, kwargs, top_k, expected_ids):
+    """Test retrieving memories by query, optionally within a time range."""
+    service, mock_repo, _ = service_env
     
-    def test_retrieve_memory_with_time_range(self):
-        """Test retrieving memories with time range filter."""
-        # Setup mock repository
-        now = datetime.now()
-        yesterday = now - timedelta(days=1)
-        
-        mock_memories = [
-            ConversationMemory(
-                id="memory1",
-                text="This is a test memory",
-                scope="TestScope",
-                tags=["test"],
-                timestamp=now,
-                conversation_id="test_convo",
-                speaker="user"
-            ),
-            ConversationMemory(
-                id="memory2",
-                text="Another test memory",
-                scope="TestScope",
-                tags=["test", "another"],
-                timestamp=yesterday,
-                conversation_id="test_convo",
-                speaker="assistant"
-            )
-        ]
-        self.mock_repo.perform_hybrid_search.return_value = [
-            (mock_memories[0], 0.95),
-            (mock_memories[1], 0.85)
-        ]
-        
-        # Create time range filter that should only include today's memory
-        time_range = {
-            "from": (now - timedelta(hours=1)).isoformat(),
-            "to": (now + timedelta(hours=1)).isoformat()
-        }
-        
-        # Call the service
-        result = self.service.retrieve_memory(
-            query="test memory",
-            scope="TestScope",
-            time_range=time_range
-        )
-        
-        # Verify the repository was called correctly
-        self.mock_repo.perform_hybrid_search.assert_called_once_with(
-            query_text="test memory", 
-            scope="TestScope", 
-            top_k=5, 
-            similarity_threshold=0.3
-        )
-        
-        # Verify the result
-        self.assertEqual(result["status"], "OK")
-        self.assertEqual(len(result["results"]), 1)
-        self.assertEqual(result["results"][0]["text"], "This is a test memory")
-        self.assertEqual(result["results"][0]["memory_id"], "memory1")
+    # Setup mock repository
+    mock_repo.perform_hybrid_search.return_value = _HITS
     
-    def test_search_by_tag(self):
-        """Test searching memories by tag."""
-        # Setup mock repository
-        mock_memories = [
-            ConversationMemory(
-                id="memory1",
-                text="This is a tagged memory",
-                scope="TestScope",
-                tags=["important"],
-                timestamp=datetime.now(),
-                conversation_id="test_convo",
-                speaker="user"
-            )
+    # Call the service
+    result = service.retrieve_memory(
+        query="test memory",
+        scope="TestScope",
+        **kwargs
+    )
+    
+    # Verify the repository was called correctly
+    mock_repo.perform_hybrid_search.assert_called_once_with(
+        query_text="test memory",
+        scope="TestScope",
+        top_k=top_k,
+        similarity_threshold=0.3
+    )
+    
+    # Verify the result
+    assert result == {
+        "status": "OK",
+        "results": [_RETRIEVE_RESULTS[memory_id] for memory_id in expected_ids]
+    }
+
+
+def test_search_by_tag(service_env):
+    """Test searching memories by tag."""
+    service, mock_repo, _ = service_env
+    
+    # Setup mock repository
+    mock_repo.get_conversations_by_tag.return_value = [_TAGGED_MEM]
+    
+    # Call the service
+    result = service.search_by_tag(tag="important")
+    
+    # Verify the repository was called correctly
+    mock_repo.get_conversations_by_tag.assert_called_once_with("important")
+    
+    # Verify the result
+    assert result == {
+        "status": "OK",
+        "results": [
+            {
+                "text": "This is a tagged memory",
+                "source": "conversation",
+                "timestamp": "2024-01-01T12:00:00",
+                "scope": "TestScope",
+                "tags": ["important"],
+                "confidence": 1.0,
+                "memory_id": "memory1"
+            }
         ]
-        self.mock_repo.get_conversations_by_tag.return_value = mock_memories
-        
-        # Call the service
-        result = self.service.search_by_tag(tag="important")
-        
-        # Verify the repository was called correctly
-        self.mock_repo.get_conversations_by_tag.assert_called_once_with("important")
-        
-        # Verify the result
-        self.assertEqual(result["status"], "OK")
-        self.assertEqual(len(result["results"]), 1)
-        self.assertEqual(result["results"][0]["text"], "This is a tagged memory")
-        self.assertEqual(result["results"][0]["tags"], ["important"])
+    }
+
+
+def test_delete_memory(service_env):
+    """Test deleting a memory by ID."""
+    service, mock_repo, _ = service_env
+    
+    # Setup mock repository
+    mock_repo.delete_memory.return_value = True
+    
+    # Call the service
+    result = service.delete_memory(memory_id="memory1")
     
-    def test_delete_memory(self):
-        """Test deleting a memory by ID."""
-        # Setup mock repository
-        self.mock_repo.delete_memory.return_value = True
-        
-        # Call the service
-        result = self.service.delete_memory(memory_id="memory1")
-        
-        # Verify the repository was called correctly
-        self.mock_repo.delete_memory.assert_called_once_with("memory1")
-        
-        # Verify the result
-        self.assertEqual(result["status"], "OK")
-        self.assertEqual(result["deleted_count"], 1)
+    # Verify the repository was called correctly
+    mock_repo.delete_memory.assert_called_once_with("memory1")
     
-    def test_get_memory_stats(self):
-        """Test getting memory statistics."""
-        # Setup mock repository
-        mock_stats = {
-            "total_memories": 10,
-            "conversation_count": 2,
-            "scopes": {"Global": 5, "TestScope": 5},
-            "last_backup": None,
-            "db_size_mb": 1.5
-        }
-        self.mock_repo.get_memory_stats.return_value = mock_stats
-        
-        # Call the service
-        result = self.service.get_memory_stats()
-        
-        # Verify the repository was called correctly
-        self.mock_repo.get_memory_stats.assert_called_once()
-        
-        # Verify the result
-        self.assertEqual(result, mock_stats)
+    # Verify the result
+    assert result == {"status": "OK", "deleted_count": 1, "scope": None}
 
 
-if __name__ == "__main__":
-    unittest.main() 
\ No newline at end of file
+def test_get_memory_stats(service_env):
+    """Test getting memory statistics."""
+    service, mock_repo, _ = service_env
+    
+    # Setup mock repository
+    mock_stats = {
+        "total_memories": 10,
+        "conversation_count": 2,
+        "scopes": {"Global": 5, "TestScope": 5},
+        "last_backup": None,
+        "db_size_mb": 1.5
+    }
+    mock_repo.get_memory_stats.return_value = mock_stats
+    
+    # Call the service
+    result = service.get_memory_stats()
+    
+    # Verify the repository was called correctly
+    mock_repo.get_memory_stats.assert_called_once()
+    
+    # Verify the result
+    assert result == mock_stats
@@ -8,49 +8,54 @@ import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
-import sys
-
-# Add the src directory to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from src.infinite_memory_mcp.db.mongo_manager import MongoManager
 
 
 class TestMongoDBManager(unittest.TestCase):
     """Test the MongoManager class."""
     
-    def setUp(self):
-        """Set up test environment."""
-        # Create a temporary directory for the test database
-        self.test_db_path = tempfile.mkdtemp()
+    # Config values read by MongoManager
+    _CONFIG = {
+        "database.mode": "external",  # Use external mode to avoid starting a MongoDB process
+        "database.uri": "mongodb://localhost:27017/claude_memory_test",
+    }
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared test environment once for all tests."""
+        # Create a temporary directory for the test database; no test writes
+        # to it, so all of them can share it
+        cls.test_db_path = tempfile.mkdtemp()
         
         # Patch the config manager
-        self.config_patcher = patch('src.infinite_memory_mcp.db.mongo_manager.config_manager')
-        self.mock_config = self.config_patcher.start()
+        cls.config_patcher = patch('src.infinite_memory_mcp.db.mongo_manager.config_manager', autospec=True)
+        cls.mock_config = cls.config_patcher.start()
         
-        # Configure the mock config
-        self.mock_config.get.side_effect = self._mock_config_get
-        self.mock_config.get_database_path.return_value = self.test_db_path
+        # Patch the MongoDB client so no test connects to a server
+        cls.mongo_client_patcher = patch('src.infinite_memory_mcp.db.mongo_manager.MongoClient', autospec=True)
+        cls.mock_mongo_client = cls.mongo_client_patcher.start()
     
-    def tearDown(self):
-        """Clean up after tests."""
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests."""
         # Stop the patchers
-        self.config_patcher.stop()
+        cls.config_patcher.stop()
+        cls.mongo_client_patcher.stop()
         
         # Remove the temporary directory
-        if os.path.exists(self.test_db_path):
-            shutil.rmtree(self.test_db_path)
+        shutil.rmtree(cls.test_db_path, ignore_errors=True)
     
-    def _mock_config_get(self, key, default=None):
-        """Mock implementation of config_manager.get."""
-        config = {
-            "database.mode": "external",  # Use external mode to avoid starting a MongoDB process
-            "database.uri": "mongodb://localhost:27017/claude_memory_test",
-        }
-        return config.get(key, default)
+    def setUp(self):
+        """Set up test environment."""
+        # Clear calls and configured results left by the previous test
+        self.mock_config.reset_mock(return_value=True, side_effect=True)
+        self.mock_mongo_client.reset_mock(return_value=True)
+        
+        # Configure the mock config
+        self.mock_config.get.side_effect = self._CONFIG.get
+        self.mock_config.get_database_path.return_value = self.test_db_path
     
-    @patch('src.infinite_memory_mcp.db.mongo_manager.MongoClient')
-    def test_init(self, mock_mongo_client):
+    def test_init(self):
         """Test initializing the MongoDB manager."""
         manager = MongoManager()
         
@@ -63,14 +68,13 @@ class TestMongoDBManager(unittest.TestCase):
         # Check the database directory was created
         self.assertTrue(os.path.exists(self.test_db_path))
     
-    @patch('src.infinite_memory_mcp.db.mongo_manager.MongoClient')
-    def test_start_external(self, mock_mongo_client):
+    def test_start_external(self):
         """Test starting the MongoDB manager in external mode."""
         # Configure the mock client
         mock_db = MagicMock()
         mock_client = MagicMock()
         mock_client.__getitem__.return_value = mock_db
-        mock_mongo_client.return_value = mock_client
+        self.mock_mongo_client.return_value = mock_client
         
         # Configure the mock database
         mock_db.list_collection_names.return_value = []
@@ -85,7 +89,7 @@ class TestMongoDBManager(unittest.TestCase):
         self.assertEqual(manager.db, mock_db)
         
         # Check the client was created with the correct URI
-        mock_mongo_client.assert_called_once_with(
+        self.mock_mongo_client.assert_called_once_with(
             "mongodb://localhost:27017/claude_memory_test",
             serverSelectionTimeoutMS=5000
         )